@@ -1,101 +1,375 @@
-﻿"""Example script for LeetCode 1307: Verbal Addition (alphametic)."""
+"""Example script for LeetCode 1307: Verbal Addition (alphametic)."""
 
 from __future__ import annotations
 
-from typing import Dict, List, Set
+from typing import Callable, Dict, List, Tuple, Union
 
 from visualizer.core import RenderSettings, Visualizer
 
+try:  # Optional Numba dependency
+    import numpy as np
+    from numba import njit
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    NUMBA_AVAILABLE = False
+    np = njit = None  # type: ignore[assignment]
+
+# A puzzle is described column by column (least significant first): each entry
+# pairs the char ids contributed by the addend words with the char id of the
+# result at that column (-1 when the result is shorter than the longest word).
+Columns = List[Tuple[Tuple[int, ...], int]]
+
+# On failure the solver reports the chars whose assignments participated in
+# the violated constraint as an int bitmask over char ids, enabling
+# conflict-directed backjumping with single-instruction unions and
+# membership tests: a char whose digit cannot affect the failure skips its
+# remaining digit trials entirely.
+Conflict = int
+Outcome = Union[bool, Conflict]
+
+
+def _make_solver(
+    columns: Columns,
+    contributors: List[Conflict],
+    leading_mask: int,
+    n_chars: int,
+) -> Callable[[int, int], Outcome]:
+    """Build a memoized column solver closed over one puzzle's structure.
+
+    The invariant puzzle description (columns, contributors, leading_mask)
+    lives in the closure; the memo key is the part of the search state the
+    remaining columns can actually observe: (column, carry, used digit
+    mask, digits of the chars still occurring in columns >= column).
+    Chars confined to completed columns are deliberately left out -- two
+    states that placed them differently but agree on the used-digit set
+    and the live chars have identical futures, so they share a memo entry.
+    The assignment is a list updated in place and undone on backtrack;
+    `owners` is the inverse mapping (digit -> char id, -1 while free),
+    kept in lockstep so both the used-digit test and conflict attribution
+    are single list reads.
+
+    Cached failures are widened to include every char of the completed
+    columns before storing: a conflict computed in one state may attribute
+    a used digit to a dead char, and a colliding state may have given that
+    digit to a different dead char, so only a mask covering all of them is
+    valid for every state that can hit the entry. The first caller still
+    receives the precise mask for conflict-directed backjumping.
+
+    The partial column sum is threaded through `place` rather than
+    recomputed: `total` starts as carry plus the already-assigned addend
+    digits and grows by digit * multiplicity as pending chars are fixed,
+    while `cap` tracks how much the still-unassigned chars could add.
+    That makes both the column-sum evaluation and the branch-and-bound
+    prune -- no value in [total, total + cap] matches the target digit
+    mod 10 -- constant-time per node.
+
+    `solve_column` returns True on success, otherwise the conflict bitmask
+    of the failure. `contributors[c]` has a bit set for every char id
+    feeding columns 0..c; it is the conflict mask for a column-sum
+    violation because the carry entering a column depends on all earlier
+    columns.
+    """
+
+    memo: Dict[Tuple[int, int, int, int], Outcome] = {}
+    assignment: List[int] = [-1] * n_chars
+    owners: List[int] = [-1] * 10
+    used_mask = 0
+    n_columns = len(columns)
+
+    # live_ids[c]: char ids occurring anywhere in columns c..end (addends
+    # or results); everything else is dead weight for the memo key.
+    live_ids: List[List[int]] = []
+    seen = 0
+    for addend_ids, result_id in reversed(columns):
+        for cid in addend_ids:
+            seen |= 1 << cid
+        if result_id >= 0:
+            seen |= 1 << result_id
+        live_ids.append([cid for cid in range(n_chars) if (seen >> cid) & 1])
+    live_ids.reverse()
+
+    # Per column: unique (char id, multiplicity) pairs over the addends.
+    col_items: List[List[Tuple[int, int]]] = []
+    for addend_ids, _ in columns:
+        items: Dict[int, int] = {}
+        for cid in addend_ids:
+            items[cid] = items.get(cid, 0) + 1
+        col_items.append(list(items.items()))
+
+    def solve_column(column: int, carry: int) -> Outcome:
+        if column == n_columns:
+            if carry == 0:
+                return True
+            return contributors[-1]
+
+        live_code = 0
+        for cid in live_ids[column]:
+            live_code = (live_code << 4) | (assignment[cid] + 1)
+        key = (column, carry, used_mask, live_code)
+        cached = memo.get(key)
+        if cached is not None:
+            return cached
+
+        result_id = columns[column][1]
+        total = carry
+        cap = 0
+        pending: List[Tuple[int, int]] = []
+        for cid, mult in col_items[column]:
+            digit = assignment[cid]
+            if digit >= 0:
+                total += digit * mult
+            else:
+                pending.append((cid, mult))
+                cap += 9 * mult
+
+        outcome = place(column, 0, total, cap, result_id, pending, len(pending))
+        if outcome is True:
+            memo[key] = True
+        else:
+            memo[key] = outcome | contributors[column]
+        return outcome
+
+    def place(
+        column: int,
+        pos: int,
+        total: int,
+        cap: int,
+        result_id: int,
+        pending: List[Tuple[int, int]],
+        n_pending: int,
+    ) -> Outcome:
+        nonlocal used_mask
+        if pos < n_pending:
+            if result_id < 0:
+                target_digit = 0
+            else:
+                target_digit = assignment[result_id]
+            if target_digit >= 0 and (target_digit - total) % 10 > cap:
+                return contributors[column]
+
+            cid, mult = pending[pos]
+            next_cap = cap - 9 * mult
+            conflict: Conflict = 0
+            for digit in range(1 if (leading_mask >> cid) & 1 else 0, 10):
+                owner = owners[digit]
+                if owner >= 0:
+                    conflict |= 1 << owner
+                    continue
+                assignment[cid] = digit
+                owners[digit] = cid
+                used_mask |= 1 << digit
+                outcome = place(
+                    column,
+                    pos + 1,
+                    total + digit * mult,
+                    next_cap,
+                    result_id,
+                    pending,
+                    n_pending,
+                )
+                assignment[cid] = -1
+                owners[digit] = -1
+                used_mask &= ~(1 << digit)
+                if outcome is True:
+                    return True
+                if not (outcome >> cid) & 1:
+                    # This char's digit cannot influence the failure; retrying
+                    # its remaining digits cannot help, so jump past it.
+                    return outcome
+                conflict |= outcome
+            return conflict & ~(1 << cid)
+
+        digit = total % 10
+        new_carry = total // 10
+
+        if result_id < 0:
+            if digit != 0:
+                return contributors[column]
+            return solve_column(column + 1, new_carry)
+
+        assigned_digit = assignment[result_id]
+        if assigned_digit >= 0:
+            if assigned_digit != digit:
+                return contributors[column]
+            return solve_column(column + 1, new_carry)
+
+        owner = owners[digit]
+        if owner >= 0:
+            return contributors[column] | (1 << owner)
+        if digit == 0 and (leading_mask >> result_id) & 1:
+            return contributors[column]
+
+        assignment[result_id] = digit
+        owners[digit] = result_id
+        used_mask |= 1 << digit
+        outcome = solve_column(column + 1, new_carry)
+        assignment[result_id] = -1
+        owners[digit] = -1
+        used_mask &= ~(1 << digit)
+        return outcome
+
+    return solve_column
+
+
+def _solve_jit(
+    col_chars,  # int8[max_len, max_slots]: addend char ids per column, -1 padded
+    col_lens,  # int8[max_len]: number of addends in each column
+    result_chars,  # int8[max_len]: result char id per column, -1 when absent
+    leading_mask: int,
+    max_len: int,
+    assignment,  # int8[n_chars]: digit per char id, -1 while unassigned
+    used,  # int8[10]: per-digit taken flag
+    column: int,
+    slot: int,
+    carry: int,
+) -> bool:
+    """Recursive kernel over flat int arrays, compiled by Numba when present.
+
+    Mirrors the word-slot backtracking order of the original solver but
+    touches only small integer arrays, so the whole recursion runs without
+    boxing Python objects once jitted.
+    """
+
+    if column == max_len:
+        return carry == 0
+
+    if slot == col_lens[column]:
+        total = carry
+        for i in range(col_lens[column]):
+            total += assignment[col_chars[column, i]]
+        digit = total % 10
+        new_carry = total // 10
+
+        res = result_chars[column]
+        if res < 0:
+            return digit == 0 and _solve_jit(
+                col_chars, col_lens, result_chars, leading_mask, max_len,
+                assignment, used, column + 1, 0, new_carry,
+            )
+        if assignment[res] >= 0:
+            return assignment[res] == digit and _solve_jit(
+                col_chars, col_lens, result_chars, leading_mask, max_len,
+                assignment, used, column + 1, 0, new_carry,
+            )
+        if used[digit]:
+            return False
+        if digit == 0 and (leading_mask >> res) & 1:
+            return False
+        assignment[res] = digit
+        used[digit] = 1
+        if _solve_jit(
+            col_chars, col_lens, result_chars, leading_mask, max_len,
+            assignment, used, column + 1, 0, new_carry,
+        ):
+            return True
+        assignment[res] = -1
+        used[digit] = 0
+        return False
+
+    cid = col_chars[column, slot]
+    if assignment[cid] >= 0:
+        return _solve_jit(
+            col_chars, col_lens, result_chars, leading_mask, max_len,
+            assignment, used, column, slot + 1, carry,
+        )
+
+    for digit in range(10):
+        if used[digit]:
+            continue
+        if digit == 0 and (leading_mask >> cid) & 1:
+            continue
+        assignment[cid] = digit
+        used[digit] = 1
+        if _solve_jit(
+            col_chars, col_lens, result_chars, leading_mask, max_len,
+            assignment, used, column, slot + 1, carry,
+        ):
+            return True
+        assignment[cid] = -1
+        used[digit] = 0
+    return False
+
+
+if NUMBA_AVAILABLE:
+    _solve_jit = njit(cache=True)(_solve_jit)
+
 
 class Solution:
     def isSolvable(self, words: List[str], result: str) -> bool:
         """Return True if there's a digit assignment that satisfies the sum."""
 
-        unique_chars: Set[str] = set("".join(words) + result)
+        unique_chars = sorted(set("".join(words) + result))
         if len(unique_chars) > 10:
             return False
 
-        leading_chars: Set[str] = {word[0] for word in words if len(word) > 1}
+        char_index = {char: idx for idx, char in enumerate(unique_chars)}
+
+        leading_mask = 0
+        for word in words:
+            if len(word) > 1:
+                leading_mask |= 1 << char_index[word[0]]
         if len(result) > 1:
-            leading_chars.add(result[0])
+            leading_mask |= 1 << char_index[result[0]]
 
         reversed_words = [word[::-1] for word in words]
         reversed_result = result[::-1]
-        max_word_len = max(len(word) for word in words)
-        max_len = max(len(result), max_word_len)
-
-        assignment: Dict[str, int] = {}
-        used_digits = [False] * 10
-
-        def solve(column: int, word_index: int, carry: int) -> bool:
-            if column == max_len:
-                return carry == 0
-
-            if word_index == len(reversed_words):
-                total = carry
-                for word in reversed_words:
-                    if column < len(word):
-                        total += assignment[word[column]]
-
-                digit = total % 10
-                new_carry = total // 10
-
-                if column < len(reversed_result):
-                    res_char = reversed_result[column]
-                    assigned_digit = assignment.get(res_char)
-                    if assigned_digit is not None:
-                        if assigned_digit != digit:
-                            return False
-                        return solve(column + 1, 0, new_carry)
-
-                    if used_digits[digit]:
-                        return False
-                    if digit == 0 and res_char in leading_chars:
-                        return False
-
-                    assignment[res_char] = digit
-                    used_digits[digit] = True
-                    try:
-                        if solve(column + 1, 0, new_carry):
-                            return True
-                    finally:
-                        used_digits[digit] = False
-                        assignment.pop(res_char, None)
-                    return False
-
-                return digit == 0 and solve(column + 1, 0, new_carry)
-
-            word = reversed_words[word_index]
-            if column >= len(word):
-                return solve(column, word_index + 1, carry)
-
-            char = word[column]
-            assigned_digit = assignment.get(char)
-            if assigned_digit is not None:
-                return solve(column, word_index + 1, carry)
-
-            for digit in range(10):
-                if used_digits[digit]:
-                    continue
-                if digit == 0 and char in leading_chars:
-                    continue
+        max_len = max(len(result), max(len(word) for word in words))
 
-                assignment[char] = digit
-                used_digits[digit] = True
-                if solve(column, word_index + 1, carry):
-                    return True
-                used_digits[digit] = False
-                assignment.pop(char, None)
+        columns: List[Tuple[Tuple[int, ...], int]] = []
+        contributors: List[Conflict] = []
+        seen_mask = 0
+        for column in range(max_len):
+            addend_ids = tuple(
+                char_index[word[column]]
+                for word in reversed_words
+                if column < len(word)
+            )
+            result_id = (
+                char_index[reversed_result[column]]
+                if column < len(reversed_result)
+                else -1
+            )
+            columns.append((addend_ids, result_id))
+            for cid in addend_ids:
+                seen_mask |= 1 << cid
+            if result_id >= 0:
+                seen_mask |= 1 << result_id
+            contributors.append(seen_mask)
 
-            return False
+        if NUMBA_AVAILABLE:
+            max_slots = max(len(addends) for addends, _ in columns)
+            col_chars = np.full((max_len, max(1, max_slots)), -1, dtype=np.int8)
+            col_lens = np.zeros(max_len, dtype=np.int8)
+            result_chars = np.full(max_len, -1, dtype=np.int8)
+            for column, (addend_ids, result_id) in enumerate(columns):
+                for slot, cid in enumerate(addend_ids):
+                    col_chars[column, slot] = cid
+                col_lens[column] = len(addend_ids)
+                result_chars[column] = result_id
+            return bool(
+                _solve_jit(
+                    col_chars,
+                    col_lens,
+                    result_chars,
+                    leading_mask,
+                    max_len,
+                    np.full(len(unique_chars), -1, dtype=np.int8),
+                    np.zeros(10, dtype=np.int8),
+                    0,
+                    0,
+                    0,
+                )
+            )
 
-        return solve(0, 0, 0)
+        solve = _make_solver(columns, contributors, leading_mask, len(unique_chars))
+        return solve(0, 0) is True
 
 
 def run_visualization() -> None:
     solver = Solution()
     settings = RenderSettings(
-        watch=["column", "word_index", "carry", "assignment", "used_digits"]
+        watch=["column", "carry", "assignment", "owners"]
     )
     visualizer = Visualizer(settings=settings)
     visualizer.run(solver.isSolvable, ["SEND", "MORE"], "MONEY")
@@ -3,37 +3,79 @@ import math
 
 from visualizer.core import RenderSettings, Visualizer
 
+try:  # Optional NumPy dependency
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    NUMPY_AVAILABLE = False
+    np = None
+
 
 class Solution:
     def countGoodSubsequences(self, s: str) -> int:
         counts = Counter(s)
+        if not counts:
+            return 0
         unique_letters = list(counts.keys())
+        freqs = [counts[letter] for letter in unique_letters]
         ans = 0
         mod = 10 ** 9 + 7
-        for bit_mask in range(1, 2 ** (len(unique_letters))):
-            current = bit_mask
-            current_letter_set = []
-            smallest_freq = float("inf")
-            for i in range(32):
-                if (current >> i) & 1:
-                    current_letter_set.append(unique_letters[i])
-                    smallest_freq = min(smallest_freq, counts[unique_letters[i]])
-            if len(current_letter_set) == 1:
-                ans += (2 ** (counts[current_letter_set[0]]) - 1) % mod
+
+        # comb_table[i][k] = C(freqs[i], k) % mod, filled once so the inner
+        # k-loop never recomputes a binomial from scratch.
+        max_f = max(freqs)
+        comb_table = [
+            [math.comb(f, k) % mod if k <= f else 0 for k in range(max_f + 1)]
+            for f in freqs
+        ]
+        if NUMPY_AVAILABLE:
+            comb_np = np.array(comb_table, dtype=np.int64)
+
+        # Walk the masks in Gray-code order: consecutive masks differ by one
+        # bit, so the selected set and its minimum frequency are maintained
+        # incrementally instead of rescanning 32 bits per mask.
+        selected = set()
+        freq_counter = [0] * (max_f + 1)
+        smallest_freq = max_f + 1
+        prev_gray = 0
+        for i in range(1, 2 ** (len(unique_letters))):
+            bit_mask = i ^ (i >> 1)
+            changed = (bit_mask ^ prev_gray).bit_length() - 1
+            prev_gray = bit_mask
+            changed_freq = freqs[changed]
+            if bit_mask & (1 << changed):
+                selected.add(changed)
+                freq_counter[changed_freq] += 1
+                if changed_freq < smallest_freq:
+                    smallest_freq = changed_freq
+            else:
+                selected.remove(changed)
+                freq_counter[changed_freq] -= 1
+                if changed_freq == smallest_freq and freq_counter[changed_freq] == 0:
+                    while freq_counter[smallest_freq] == 0:
+                        smallest_freq += 1
+            if len(selected) == 1:
+                ans += (pow(2, smallest_freq, mod) - 1) % mod
+            elif NUMPY_AVAILABLE:
+                # Vectorize over k: one modular multiply per selected letter
+                # instead of a Python loop over every (k, letter) pair.
+                products = np.ones(smallest_freq, dtype=np.int64)
+                for idx in selected:
+                    products = products * comb_np[idx, 1 : smallest_freq + 1] % mod
+                ans += int(products.sum()) % mod
             else:
-                for k in range(1, int(smallest_freq) + 1):
+                for k in range(1, smallest_freq + 1):
                     result = 1
-                    for letter in current_letter_set:
-                        if counts[letter] >= k:
-                            ways = math.comb(counts[letter], k)
-                            result *= (ways % mod)
-                    ans += (result % mod)
+                    for idx in selected:
+                        result = result * comb_table[idx][k] % mod
+                    ans += result
         return ans % mod
 
 
 def run_visualization():
     solver = Solution()
-    settings = RenderSettings(watch=["ans", "current_letter_set", "bit_mask", "result"])
+    settings = RenderSettings(watch=["ans", "selected", "bit_mask", "smallest_freq"])
     visualizer = Visualizer(settings=settings)
     visualizer.run(solver.countGoodSubsequences, "aabc")
 
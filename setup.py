@@ -0,0 +1,24 @@
+"""Build script for the optional compiled trace shim.
+
+Run `python setup.py build_ext --inplace` with Cython installed to build
+visualizer._trace_ext; everything works without it via the pure-Python
+trace callback.
+"""
+
+from setuptools import setup
+
+try:
+    from Cython.Build import cythonize
+except ImportError:  # pragma: no cover - optional dependency
+    ext_modules = []
+else:
+    ext_modules = cythonize(
+        "visualizer/_trace_ext.pyx",
+        compiler_directives={"language_level": 3, "boundscheck": False},
+    )
+
+setup(
+    name="leetcode-visualizer",
+    packages=["visualizer"],
+    ext_modules=ext_modules,
+)
@@ -5,22 +5,49 @@ from __future__ import annotations
 import argparse
 import ast
 import importlib.util
+import json
 import sys
 from pathlib import Path
-from typing import Any, List
+from typing import Any, Dict, List
 
 from visualizer.core import RenderSettings, Visualizer
 
+_MODULE_CACHE: Dict[str, Any] = {}
+
 
 def _load_module(path: Path):
+    key = str(path)
+    cached = _MODULE_CACHE.get(key)
+    if cached is not None:
+        return cached
     spec = importlib.util.spec_from_file_location(path.stem, path)
     if spec is None or spec.loader is None:
         raise ImportError(f"Cannot import module from {path}")
     module = importlib.util.module_from_spec(spec)
     spec.loader.exec_module(module)
+    _MODULE_CACHE[key] = module
     return module
 
 
+def _fast_literal(text: str) -> Any:
+    """Parse a literal, preferring json over the full Python grammar.
+
+    json.loads covers the common numbers/strings/lists/dicts cases much
+    faster than ast.literal_eval; Python-only literals such as tuples or
+    sets fall back to ast.
+    """
+
+    stripped = text.strip()
+    if stripped == "()":
+        return ()
+    if stripped == "{}":
+        return {}
+    try:
+        return json.loads(stripped)
+    except json.JSONDecodeError:
+        return ast.literal_eval(stripped)
+
+
 def _parse_args(argv: List[str]) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Step through Python code visually.")
     parser.add_argument("script", type=Path, help="Path to the Python script containing the target callable.")
@@ -32,6 +59,16 @@ def _parse_args(argv: List[str]) -> argparse.Namespace:
         default="",
         help="Comma separated list of variable names to emphasize in the output.",
     )
+    parser.add_argument(
+        "--replay-cache",
+        action="store_true",
+        help="Record the event stream and replay it on identical invocations.",
+    )
+    parser.add_argument(
+        "--fresh",
+        action="store_true",
+        help="Ignore a cached recording and re-execute the target.",
+    )
     return parser.parse_args(argv)
 
 
@@ -45,7 +82,7 @@ def main(argv: List[str] | None = None) -> int:
         raise SystemExit(f"Failed to evaluate expression '{args.expr}': {exc}")
 
     try:
-        positional = ast.literal_eval(args.args)
+        positional = _fast_literal(args.args)
     except Exception as exc:  # noqa: BLE001
         raise SystemExit(f"--args must be a valid Python literal tuple: {exc}")
 
@@ -53,7 +90,7 @@ def main(argv: List[str] | None = None) -> int:
         positional = (positional,)
 
     try:
-        keyword = ast.literal_eval(args.kwargs)
+        keyword = _fast_literal(args.kwargs)
     except Exception as exc:  # noqa: BLE001
         raise SystemExit(f"--kwargs must be a valid Python literal dict: {exc}")
 
@@ -61,7 +98,11 @@ def main(argv: List[str] | None = None) -> int:
         raise SystemExit("--kwargs must evaluate to a dict")
 
     watch_list = [name.strip() for name in args.watch.split(",") if name.strip()]
-    settings = RenderSettings(watch=watch_list)
+    settings = RenderSettings(
+        watch=watch_list,
+        replay_cache=args.replay_cache or args.fresh,
+        replay_fresh=args.fresh,
+    )
     visualizer = Visualizer(settings=settings)
 
     try:
@@ -0,0 +1,54 @@
+# cython: language_level=3, boundscheck=False
+"""Compiled sys.settrace shim.
+
+Performs the per-event filtering (target-file check, continue-mode
+suppression, root-frame tracking) in C and only calls back into Python
+for events the visualizer actually renders. Built optionally via
+`python setup.py build_ext --inplace`; visualizer.core falls back to the
+pure-Python callback when the extension is missing.
+"""
+
+cdef object _target = None
+cdef object _handler = None
+cdef object _root_frame = None
+cdef bint _continue = False
+
+
+def configure(target, handler):
+    """Install the target filename and the Python-level event handler."""
+
+    global _target, _handler, _root_frame, _continue
+    _target = target
+    _handler = handler
+    _root_frame = None
+    _continue = False
+
+
+def set_continue(bint flag):
+    global _continue
+    _continue = flag
+
+
+def reset():
+    configure(None, None)
+
+
+def trace_callback(frame, str event, arg):
+    global _root_frame
+
+    if _target is None:
+        return None
+
+    if _continue and frame is not _root_frame:
+        # Uninstall the local trace for this frame entirely.
+        return None
+
+    filename = frame.f_code.co_filename
+    if filename is not _target and filename != _target:
+        return trace_callback
+
+    if _root_frame is None and event == "call":
+        _root_frame = frame
+
+    _handler(frame, event, arg)
+    return trace_callback
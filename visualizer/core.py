@@ -2,28 +2,40 @@
 
 from __future__ import annotations
 
+import hashlib
+import importlib.util
 import inspect
 import linecache
-import pprint
+import pickle
+import reprlib
 import sys
 from dataclasses import dataclass, field
 from pathlib import Path
-from types import FrameType
-from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from types import CodeType, FrameType, MethodType
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Tuple
 
-try:  # Optional Rich dependency
+if TYPE_CHECKING:  # Optional Rich dependency, imported lazily in _setup_rich_ui
     from rich.console import Console
     from rich.layout import Layout
     from rich.live import Live
     from rich.panel import Panel
-    from rich.syntax import Syntax
-    from rich.table import Table
-    from rich.text import Text
 
-    RICH_AVAILABLE = True
-except ImportError:  # pragma: no cover - optional dependency
-    RICH_AVAILABLE = False
-    Console = Layout = Live = Panel = Syntax = Table = Text = None  # type: ignore[misc,assignment]
+# Importing Rich pulls in Pygments lexer registration and costs tens of
+# milliseconds; defer it until a rich UI is actually set up so plain-text
+# runs and --help never pay for it.
+RICH_AVAILABLE = importlib.util.find_spec("rich") is not None
+
+# PEP 669 low-impact monitoring: events can be scoped to individual code
+# objects, so library code never triggers a Python-level callback.
+MONITORING_AVAILABLE = sys.version_info >= (3, 12)
+
+try:  # Optional compiled trace shim (see setup.py)
+    from visualizer import _trace_ext
+
+    TRACE_EXT_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional extension
+    TRACE_EXT_AVAILABLE = False
+    _trace_ext = None  # type: ignore[assignment]
 
 
 @dataclass
@@ -33,6 +45,14 @@ class RenderSettings:
     watch: Sequence[str] = field(default_factory=list)
     use_rich: bool = True
     rich_theme: str = "monokai"
+    # Persist the event stream keyed by (source, args, kwargs) and replay it
+    # on identical invocations instead of re-executing the traced code.
+    replay_cache: bool = False
+    # Ignore an existing recording and re-execute (refreshing the cache).
+    replay_fresh: bool = False
+
+
+REPLAY_CACHE_DIR = Path.home() / ".cache" / "leetcode-viz"
 
 
 class Visualizer:
@@ -46,15 +66,37 @@ class Visualizer:
                 file=sys.stderr,
             )
         self._use_rich = bool(self.settings.use_rich and RICH_AVAILABLE)
+        # reprlib stops formatting at the truncation limits instead of
+        # walking an entire container only to throw most of the text away.
+        self._repr = reprlib.Repr()
+        self._repr.maxstring = self.settings.max_value_repr
+        self._repr.maxother = self.settings.max_value_repr
+        self._repr.maxlist = self._repr.maxdict = self._repr.maxset = 20
+        self._repr.maxtuple = self._repr.maxfrozenset = 20
+        self._repr.maxlevel = 4
         self._continue_until_return = False
         self._target_filename: Optional[str] = None
         self._root_frame: Optional[FrameType] = None
         self._active = False
         self._source_path: Optional[Path] = None
-        self._source_total_lines: int = 0
+        self._source_lines: List[str] = []
+        self._source_lines_stripped: List[str] = []
         self._console: Optional[Console] = None
         self._layout: Optional[Layout] = None
         self._live: Optional[Live] = None
+        self._Console: Any = None
+        self._Layout: Any = None
+        self._Live: Any = None
+        self._Panel: Any = None
+        self._Syntax: Any = None
+        self._Table: Any = None
+        self._Text: Any = None
+        self._monitored_codes: List[CodeType] = []
+        self._watch_tuple: Tuple[str, ...] = ()
+        self._watch_set: frozenset = frozenset()
+        self._syntax_cache: Dict[Tuple[int, int, int], Panel] = {}
+        self._frame_cache: Dict[int, str] = {}
+        self._recording: Optional[List[Dict[str, Any]]] = None
 
     def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
         """Execute `func` while interactively visualizing each step."""
@@ -65,11 +107,27 @@ class Visualizer:
         self._active = True
         try:
             self._prepare(func)
-            sys.settrace(self._trace)
-            try:
-                result = func(*args, **kwargs)
-            finally:
-                sys.settrace(None)
+
+            cache_path: Optional[Path] = None
+            if self.settings.replay_cache:
+                cache_path = self._replay_cache_path(func, args, kwargs)
+            if (
+                cache_path is not None
+                and not self.settings.replay_fresh
+                and cache_path.exists()
+            ):
+                cached = self._load_replay(cache_path)
+                if cached is not None:
+                    records, result = cached
+                    self._replay(records)
+                    return result
+            if cache_path is not None:
+                self._recording = []
+
+            result = self._execute_traced(func, args, kwargs)
+
+            if cache_path is not None and self._recording is not None:
+                self._store_replay(cache_path, self._recording, result)
             return result
         finally:
             if self._use_rich:
@@ -78,6 +136,32 @@ class Visualizer:
             self._root_frame = None
             self._target_filename = None
             self._continue_until_return = False
+            self._frame_cache.clear()
+            self._recording = None
+
+    def _execute_traced(
+        self, func: Callable[..., Any], args: Tuple[Any, ...], kwargs: Dict[str, Any]
+    ) -> Any:
+        if MONITORING_AVAILABLE and self._setup_monitoring(func):
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._teardown_monitoring()
+        if TRACE_EXT_AVAILABLE:
+            # The compiled shim filters events at C speed and only
+            # calls back into Python for ones we render.
+            _trace_ext.configure(self._target_filename, self._handle_event)
+            sys.settrace(_trace_ext.trace_callback)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                sys.settrace(None)
+                _trace_ext.reset()
+        sys.settrace(self._trace)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            sys.settrace(None)
 
     # ------------------------------------------------------------------
     # Trace plumbing
@@ -88,58 +172,258 @@ class Visualizer:
             raise ValueError("Cannot locate source for callable")
         self._target_filename = filename
         self._source_path = Path(filename)
-        try:
-            self._source_total_lines = len(
-                self._source_path.read_text(encoding="utf-8").splitlines()
-            )
-        except OSError:
-            self._source_total_lines = 0
+        self._source_lines = linecache.getlines(filename)
+        if not self._source_lines:
+            try:
+                self._source_lines = self._source_path.read_text(
+                    encoding="utf-8"
+                ).splitlines(keepends=True)
+            except OSError:
+                self._source_lines = []
+        # Pre-strip once so the per-event render loops never call rstrip.
+        self._source_lines_stripped = [line.rstrip() for line in self._source_lines]
+        self._watch_tuple = tuple(self.settings.watch)
+        self._watch_set = frozenset(self._watch_tuple)
+        self._syntax_cache.clear()
+        self._compile_render()
         if self._use_rich:
             self._setup_rich_ui()
 
+    def _compile_render(self) -> None:
+        """Generate the instance's `_render`, specialized to this run.
+
+        The render mode, watch list and recording toggle never change while
+        a run is in flight, so the per-event branches are partially
+        evaluated away: watch lookups become literal key accesses and the
+        rich/plain dispatch disappears entirely. This is the only `_render`
+        implementation; `_prepare` installs it before any event fires.
+        """
+
+        lines = [
+            "def _render_specialized(self, frame, event, arg):",
+            "    payload = self._build_event_payload(frame, event, arg)",
+            "    if event == 'call':",
+            "        watch_items = []",
+            "        locals_items = []",
+            "    else:",
+            "        frame_locals = frame.f_locals",
+            "        safe_repr = self._safe_repr",
+            "        watch_items = []",
+        ]
+        for name in self._watch_tuple:
+            key = repr(name)
+            lines.append(f"        if {key} in frame_locals:")
+            lines.append(
+                f"            watch_items.append(({key}, safe_repr(frame_locals[{key}])))"
+            )
+        lines.extend(
+            [
+                "        locals_items = [",
+                "            (name, safe_repr(value))",
+                "            for name, value in frame_locals.items()",
+                "            if name[:2] != '__' and name not in _watch_set",
+                "        ]",
+            ]
+        )
+        if self.settings.replay_cache:
+            lines.extend(
+                [
+                    "    if self._recording is not None:",
+                    "        self._recording.append({",
+                    "            'event': event,",
+                    "            'is_root': frame is self._root_frame,",
+                    "            'payload': payload,",
+                    "            'watch': watch_items,",
+                    "            'locals': locals_items,",
+                    "        })",
+                ]
+            )
+        target = "_render_rich" if self._use_rich else "_render_plain"
+        lines.append(f"    self.{target}(payload, watch_items, locals_items)")
+
+        namespace: Dict[str, Any] = {"_watch_set": self._watch_set}
+        exec("\n".join(lines), namespace)  # noqa: S102 - template built above
+        self._render = MethodType(namespace["_render_specialized"], self)
+
     def _trace(self, frame: FrameType, event: str, arg: Any):
-        if self._target_filename is None:
+        # This callback fires for every executed line, so hoist attribute
+        # reads into locals (LOAD_FAST instead of LOAD_ATTR per access).
+        target = self._target_filename
+        if target is None:
             return None
 
-        if frame.f_code.co_filename != self._target_filename:
-            return self._trace
+        if self._continue_until_return and frame is not self._root_frame:
+            # Returning None uninstalls the local trace function for this
+            # frame, so CPython stops calling us for its lines entirely.
+            return None
+
+        trace = self._trace
+        if frame.f_code.co_filename != target:
+            return trace
+
+        self._handle_event(frame, event, arg)
+        return trace
+
+    def _handle_event(self, frame: FrameType, event: str, arg: Any) -> None:
+        root = self._root_frame
+        if root is None:
+            if event != "call":
+                return
+            self._root_frame = root = frame
+
+        continuing = self._continue_until_return
+        if continuing and frame is not root:
+            return
 
-        if self._root_frame is None and event == "call":
-            self._root_frame = frame
+        if event not in {"call", "line", "return", "exception"}:
+            return
 
-        if not self._should_handle(frame, event):
-            return self._trace
+        if event == "call":
+            # Formatted arg values never change for a frame; cache them so
+            # later events for the frame reuse the string.
+            self._frame_cache[id(frame)] = self._format_call_details(frame)
 
         self._render(frame, event, arg)
 
-        if not self._continue_until_return or frame is self._root_frame and event == "return":
+        if event == "return":
+            self._frame_cache.pop(id(frame), None)
+
+        if not continuing or frame is root and event == "return":
             self._prompt()
 
-        return self._trace
+    # ------------------------------------------------------------------
+    # sys.monitoring backend (CPython 3.12+)
+    # ------------------------------------------------------------------
+    _TOOL_ID = 0  # sys.monitoring.DEBUGGER_ID
 
-    def _should_handle(self, frame: FrameType, event: str) -> bool:
-        if self._root_frame is None:
-            return event == "call"
+    def _collect_code_objects(self, func: Callable[..., Any]) -> List[CodeType]:
+        """Gather all code objects defined in the target file.
 
-        if self._continue_until_return and frame is not self._root_frame:
-            return False
+        Seeds the walk with every function in the target module's namespace
+        (unwrapping functools decorators, and including methods of classes
+        defined there), not just the traced callable -- module-level helpers
+        it calls must be monitored too. Nested code objects (closures,
+        comprehensions) are then found by recursing into co_consts.
+        """
 
-        return event in {"call", "line", "return", "exception"}
+        target = self._target_filename
+        seen: set = set()
+        stack: List[CodeType] = []
+
+        def add_callable(obj: Any) -> None:
+            try:
+                code = inspect.unwrap(obj).__code__
+            except (AttributeError, ValueError):
+                return
+            if code.co_filename == target and id(code) not in seen:
+                seen.add(id(code))
+                stack.append(code)
+
+        add_callable(func)
+        module = inspect.getmodule(func)
+        if module is not None:
+            for value in vars(module).values():
+                if inspect.isroutine(value):
+                    add_callable(value)
+                elif inspect.isclass(value):
+                    for attr in vars(value).values():
+                        if isinstance(attr, (staticmethod, classmethod)):
+                            attr = attr.__func__
+                        if inspect.isroutine(attr):
+                            add_callable(attr)
+
+        collected: List[CodeType] = []
+        while stack:
+            code = stack.pop()
+            collected.append(code)
+            for const in code.co_consts:
+                if (
+                    isinstance(const, CodeType)
+                    and const.co_filename == target
+                    and id(const) not in seen
+                ):
+                    seen.add(id(const))
+                    stack.append(const)
+        return collected
+
+    def _setup_monitoring(self, func: Callable[..., Any]) -> bool:
+        monitoring = sys.monitoring
+        events = monitoring.events
+        try:
+            monitoring.use_tool_id(self._TOOL_ID, "leetcode-visualizer")
+        except ValueError:
+            # Another tool (typically a debugger) already holds the id;
+            # let the caller fall back to the settrace backends.
+            return False
+        try:
+            monitoring.register_callback(
+                self._TOOL_ID, events.LINE, self._on_monitor_line
+            )
+            monitoring.register_callback(
+                self._TOOL_ID, events.PY_START, self._on_monitor_start
+            )
+            monitoring.register_callback(
+                self._TOOL_ID, events.PY_RETURN, self._on_monitor_return
+            )
+            monitoring.register_callback(
+                self._TOOL_ID, events.RAISE, self._on_monitor_raise
+            )
+            self._monitored_codes = self._collect_code_objects(func)
+            # RAISE is not a valid local event, so it is enabled globally and
+            # filtered by filename in the callback instead.
+            wanted = events.LINE | events.PY_START | events.PY_RETURN
+            for code in self._monitored_codes:
+                monitoring.set_local_events(self._TOOL_ID, code, wanted)
+            monitoring.set_events(self._TOOL_ID, events.RAISE)
+        except Exception:
+            self._teardown_monitoring()
+            raise
+        return True
+
+    def _teardown_monitoring(self) -> None:
+        monitoring = sys.monitoring
+        events = monitoring.events
+        monitoring.set_events(self._TOOL_ID, events.NO_EVENTS)
+        for code in self._monitored_codes:
+            monitoring.set_local_events(self._TOOL_ID, code, events.NO_EVENTS)
+        for event in (events.LINE, events.PY_START, events.PY_RETURN, events.RAISE):
+            monitoring.register_callback(self._TOOL_ID, event, None)
+        monitoring.free_tool_id(self._TOOL_ID)
+        self._monitored_codes = []
+
+    def _on_monitor_line(self, code: CodeType, line_number: int) -> None:
+        self._handle_event(sys._getframe(1), "line", None)
+
+    def _on_monitor_start(self, code: CodeType, instruction_offset: int) -> None:
+        self._handle_event(sys._getframe(1), "call", None)
+
+    def _on_monitor_return(
+        self, code: CodeType, instruction_offset: int, retval: Any
+    ) -> None:
+        self._handle_event(sys._getframe(1), "return", retval)
+
+    def _on_monitor_raise(
+        self, code: CodeType, instruction_offset: int, exception: BaseException
+    ) -> None:
+        # RAISE fires globally (it cannot be scoped per code object), so
+        # drop events from outside the target file here.
+        if code.co_filename != self._target_filename:
+            return
+        self._handle_event(
+            sys._getframe(1), "exception", (type(exception), exception, None)
+        )
 
     # ------------------------------------------------------------------
     # Rendering helpers
     # ------------------------------------------------------------------
-    def _render(self, frame: FrameType, event: str, arg: Any) -> None:
-        if self._use_rich:
-            self._render_rich(frame, event, arg)
-        else:
-            self._render_plain(frame, event, arg)
-
-    def _render_plain(self, frame: FrameType, event: str, arg: Any) -> None:
-        payload = self._build_event_payload(frame, event, arg)
+    def _render_plain(
+        self,
+        payload: Dict[str, Any],
+        watch_items: List[Tuple[str, str]],
+        locals_items: List[Tuple[str, str]],
+    ) -> None:
         header = self._format_plain_header(payload)
-        code_block = self._format_plain_code(frame.f_lineno)
-        watch_items, locals_items = self._gather_locals(frame)
+        code_block = self._format_plain_code(payload["lineno"])
         locals_block = self._format_plain_locals(watch_items, locals_items)
 
         segments = [header, code_block]
@@ -148,24 +432,28 @@ class Visualizer:
 
         print("\n".join(segments), flush=True)
 
-    def _render_rich(self, frame: FrameType, event: str, arg: Any) -> None:
-        assert self._layout is not None
-        payload = self._build_event_payload(frame, event, arg)
-        watch_items, locals_items = self._gather_locals(frame)
-        self._layout["header"].update(self._rich_header(payload))
-        self._layout["code"].update(self._rich_code_panel(frame.f_lineno))
-        self._layout["watch"].update(self._rich_table_panel("Watch", watch_items))
-        self._layout["locals"].update(self._rich_table_panel("Locals", locals_items))
-        self._layout["footer"].update(self._rich_footer(payload))
-        assert self._live is not None
-        self._live.refresh()
+    def _render_rich(
+        self,
+        payload: Dict[str, Any],
+        watch_items: List[Tuple[str, str]],
+        locals_items: List[Tuple[str, str]],
+    ) -> None:
+        layout = self._layout
+        assert layout is not None
+        layout["header"].update(self._rich_header(payload))
+        layout["code"].update(self._rich_code_panel(payload["lineno"]))
+        layout["watch"].update(self._rich_table_panel("Watch", watch_items))
+        layout["locals"].update(self._rich_table_panel("Locals", locals_items))
+        layout["footer"].update(self._rich_footer(payload))
 
     def _build_event_payload(self, frame: FrameType, event: str, arg: Any) -> Dict[str, Any]:
         func_name = frame.f_code.co_name
         lineno = frame.f_lineno
         label = event.upper()
         if event == "call":
-            details = self._format_call_details(frame)
+            details = self._frame_cache.get(id(frame))
+            if details is None:
+                details = self._format_call_details(frame)
             line_display = frame.f_code.co_firstlineno
         elif event == "return":
             details = f"return value = {self._safe_repr(arg)}"
@@ -193,37 +481,34 @@ class Visualizer:
         return header.rstrip()
 
     def _format_plain_code(self, lineno: int) -> str:
-        assert self._target_filename is not None
         start = max(1, lineno - self.settings.context_lines)
         end = lineno + self.settings.context_lines
         lines: List[str] = []
-        for idx in range(start, end + 1):
-            raw_line = linecache.getline(self._target_filename, idx)
-            if not raw_line:
-                continue
+        window = self._source_lines_stripped[start - 1 : end]
+        for idx, stripped in enumerate(window, start=start):
             marker = "->" if idx == lineno else "  "
-            lines.append(f"{marker} {idx:>4}: {raw_line.rstrip()}")
+            lines.append(f"{marker} {idx:>4}: {stripped}")
         return "\n".join(lines)
 
     def _format_plain_locals(
         self,
-        watch_items: List[Tuple[str, Any]],
-        locals_items: List[Tuple[str, Any]],
+        watch_items: List[Tuple[str, str]],
+        locals_items: List[Tuple[str, str]],
     ) -> str:
         items: List[str] = []
         if watch_items:
             items.append("* Watch vars")
             for name, value in watch_items:
-                items.append(f"    {name} = {self._safe_repr(value)}")
+                items.append(f"    {name} = {value}")
         if locals_items:
             items.append("* Locals")
             for name, value in locals_items:
-                items.append(f"    {name} = {self._safe_repr(value)}")
+                items.append(f"    {name} = {value}")
         return "\n".join(items)
 
     def _rich_header(self, payload: Dict[str, Any]) -> Panel:
         assert RICH_AVAILABLE
-        text = Text()
+        text = self._Text()
         text.append(payload["label"], style="bold magenta")
         text.append("  ")
         text.append(payload["func_name"], style="bold white")
@@ -231,25 +516,26 @@ class Visualizer:
         if payload["details"]:
             text.append("\n")
             text.append(payload["details"], style="cyan")
-        return Panel(text, title="Event", border_style="magenta")
+        return self._Panel(text, title="Event", border_style="magenta")
 
     def _rich_code_panel(self, lineno: int) -> Panel:
         assert self._target_filename is not None and RICH_AVAILABLE
         start = max(1, lineno - self.settings.context_lines)
-        max_line = self._source_total_lines or lineno + self.settings.context_lines
-        end = min(max_line, lineno + self.settings.context_lines)
-        source_lines: List[str] = []
-        for idx in range(start, end + 1):
-            raw_line = linecache.getline(self._target_filename, idx)
-            if not raw_line:
-                continue
-            source_lines.append(raw_line.rstrip("\n"))
+        end = lineno + self.settings.context_lines
+        # Building a Syntax re-tokenizes the window through Pygments, so
+        # reuse the panel whenever the same window/highlight recurs (the
+        # common case when stepping around a loop).
+        cache_key = (start, end, lineno)
+        cached = self._syntax_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        source_lines = self._source_lines_stripped[start - 1 : end]
         if not source_lines:
             source_lines = ["<source unavailable>"]
         code = "\n".join(source_lines)
         line_range = (start, start + len(source_lines) - 1)
         highlight = {lineno} if source_lines and "<source unavailable>" not in source_lines else set()
-        syntax = Syntax(
+        syntax = self._Syntax(
             code,
             "python",
             line_numbers=True,
@@ -259,64 +545,89 @@ class Visualizer:
             indent_guides=True,
         )
         title = f"{self._source_path.name}:{lineno}" if self._source_path else f"line {lineno}"
-        return Panel(syntax, title=title, border_style="green")
+        panel = self._Panel(syntax, title=title, border_style="green")
+        if len(self._syntax_cache) >= max(16, 4 * self.settings.context_lines):
+            self._syntax_cache.clear()
+        self._syntax_cache[cache_key] = panel
+        return panel
 
-    def _rich_table_panel(self, title: str, items: List[Tuple[str, Any]]) -> Panel:
+    def _rich_table_panel(self, title: str, items: List[Tuple[str, str]]) -> Panel:
         assert RICH_AVAILABLE
-        table = Table(show_header=False, expand=True, box=None, pad_edge=False)
+        table = self._Table(show_header=False, expand=True, box=None, pad_edge=False)
         table.add_column(style="bold cyan", no_wrap=True)
         table.add_column(overflow="fold")
         if items:
             for name, value in items:
-                table.add_row(name, self._safe_repr(value))
+                table.add_row(name, value)
         else:
             table.add_row("[dim]--[/dim]", "[dim]empty[/dim]")
-        return Panel(table, title=title, border_style="blue")
+        return self._Panel(table, title=title, border_style="blue")
 
     def _rich_footer(self, payload: Dict[str, Any]) -> Panel:
         assert RICH_AVAILABLE
-        text = Text("Step: Enter | Continue: c | Quit: q", style="bold")
+        text = self._Text("Step: Enter | Continue: c | Quit: q", style="bold")
         text.append(
             f"\nLast event: {payload['label']} at line {payload['lineno']}",
             style="dim",
         )
-        return Panel(text, border_style="magenta", title="Controls")
+        return self._Panel(text, border_style="magenta", title="Controls")
+
+    def _import_rich(self) -> None:
+        from rich.console import Console
+        from rich.layout import Layout
+        from rich.live import Live
+        from rich.panel import Panel
+        from rich.syntax import Syntax
+        from rich.table import Table
+        from rich.text import Text
+
+        self._Console = Console
+        self._Layout = Layout
+        self._Live = Live
+        self._Panel = Panel
+        self._Syntax = Syntax
+        self._Table = Table
+        self._Text = Text
 
     def _setup_rich_ui(self) -> None:
         assert RICH_AVAILABLE
-        self._console = Console()
+        self._import_rich()
+        self._console = self._Console()
         self._layout = self._build_layout()
-        self._live = Live(
+        # Let Rich repaint on its own clock: during continue mode thousands
+        # of events per second collapse into at most ~30 redraws.
+        self._live = self._Live(
             self._layout,
             console=self._console,
             screen=True,
-            auto_refresh=False,
+            auto_refresh=True,
+            refresh_per_second=30,
         )
         self._live.start()
 
     def _build_layout(self) -> Layout:
         assert RICH_AVAILABLE
-        layout = Layout(name="root")
+        layout = self._Layout(name="root")
         layout.split(
-            Layout(name="header", size=3),
-            Layout(name="body", ratio=1),
-            Layout(name="footer", size=3),
+            self._Layout(name="header", size=3),
+            self._Layout(name="body", ratio=1),
+            self._Layout(name="footer", size=3),
         )
         layout["body"].split_row(
-            Layout(name="code", ratio=3),
-            Layout(name="sidebar", ratio=2),
+            self._Layout(name="code", ratio=3),
+            self._Layout(name="sidebar", ratio=2),
         )
         layout["sidebar"].split(
-            Layout(name="watch", ratio=1),
-            Layout(name="locals", ratio=2),
+            self._Layout(name="watch", ratio=1),
+            self._Layout(name="locals", ratio=2),
         )
-        layout["header"].update(Panel(Text("Waiting for trace"), title="Event"))
-        layout["code"].update(Panel(Text("--"), title="Source"))
-        layout["watch"].update(Panel(Text("No watch vars"), title="Watch"))
-        layout["locals"].update(Panel(Text("Locals will appear here"), title="Locals"))
+        layout["header"].update(self._Panel(self._Text("Waiting for trace"), title="Event"))
+        layout["code"].update(self._Panel(self._Text("--"), title="Source"))
+        layout["watch"].update(self._Panel(self._Text("No watch vars"), title="Watch"))
+        layout["locals"].update(self._Panel(self._Text("Locals will appear here"), title="Locals"))
         layout["footer"].update(
-            Panel(
-                Text("Step: Enter | Continue: c | Quit: q", style="bold"),
+            self._Panel(
+                self._Text("Step: Enter | Continue: c | Quit: q", style="bold"),
                 title="Controls",
             )
         )
@@ -329,24 +640,6 @@ class Visualizer:
         self._layout = None
         self._console = None
 
-    def _gather_locals(
-        self, frame: FrameType
-    ) -> Tuple[List[Tuple[str, Any]], List[Tuple[str, Any]]]:
-        locals_view: Dict[str, Any] = {
-            k: v for k, v in frame.f_locals.items() if not k.startswith("__")
-        }
-        watch_items: List[Tuple[str, Any]] = []
-        watch_set = set(self.settings.watch)
-        for name in self.settings.watch:
-            if name in locals_view:
-                watch_items.append((name, locals_view[name]))
-        locals_items = [
-            (name, value)
-            for name, value in sorted(locals_view.items())
-            if name not in watch_set
-        ]
-        return watch_items, locals_items
-
     def _format_call_details(self, frame: FrameType) -> str:
         arg_info = inspect.getargvalues(frame)
         pairs = []
@@ -365,18 +658,121 @@ class Visualizer:
 
     def _safe_repr(self, value: Any) -> str:
         try:
-            formatted = pprint.pformat(value, width=80, compact=True)
+            formatted = self._repr.repr(value)
         except Exception:
-            formatted = repr(value)
+            formatted = object.__repr__(value)
 
         if len(formatted) > self.settings.max_value_repr:
             return formatted[: self.settings.max_value_repr - 3] + "..."
         return formatted
 
+    # ------------------------------------------------------------------
+    # Replay cache
+    # ------------------------------------------------------------------
+    def _replay_cache_path(
+        self,
+        func: Callable[..., Any],
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+    ) -> Optional[Path]:
+        # The recorded snapshots bake in the render configuration (which
+        # locals were gathered, truncation limits, rich vs plain output),
+        # so anything that changes what gets recorded must key the cache.
+        settings = self.settings
+        try:
+            key_material = repr(
+                (
+                    inspect.getsource(func),
+                    args,
+                    kwargs,
+                    tuple(settings.watch),
+                    settings.context_lines,
+                    settings.max_value_repr,
+                    self._use_rich,
+                )
+            )
+        except (OSError, TypeError):
+            return None
+        digest = hashlib.blake2b(
+            key_material.encode("utf-8"), digest_size=16
+        ).hexdigest()
+        try:
+            REPLAY_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        except OSError:
+            return None
+        return REPLAY_CACHE_DIR / f"{digest}.pickle"
+
+    def _load_replay(
+        self, path: Path
+    ) -> Optional[Tuple[List[Dict[str, Any]], Any]]:
+        try:
+            with path.open("rb") as handle:
+                records, result = pickle.load(handle)
+        except Exception:  # noqa: BLE001 - a stale/corrupt cache just re-runs
+            return None
+        return records, result
+
+    def _store_replay(
+        self, path: Path, records: List[Dict[str, Any]], result: Any
+    ) -> None:
+        try:
+            with path.open("wb") as handle:
+                pickle.dump((records, result), handle)
+        except (OSError, pickle.PicklingError):
+            path.unlink(missing_ok=True)
+
+    def _replay(self, records: List[Dict[str, Any]]) -> None:
+        """Drive the renderer from a recorded event stream.
+
+        The snapshots already hold truncated repr strings, so they feed the
+        same render paths as live frames."""
+
+        for record in records:
+            if self._continue_until_return and not record["is_root"]:
+                continue
+            if self._use_rich:
+                self._render_rich(record["payload"], record["watch"], record["locals"])
+            else:
+                self._render_plain(record["payload"], record["watch"], record["locals"])
+            if not self._continue_until_return or (
+                record["is_root"] and record["event"] == "return"
+            ):
+                self._prompt()
+
     # ------------------------------------------------------------------
     # Interaction
     # ------------------------------------------------------------------
+    def _set_continue(self, flag: bool) -> None:
+        self._continue_until_return = flag
+        if TRACE_EXT_AVAILABLE and not MONITORING_AVAILABLE:
+            _trace_ext.set_continue(flag)
+        if flag and not MONITORING_AVAILABLE:
+            self._disable_subframe_tracing()
+
+    def _disable_subframe_tracing(self) -> None:
+        """Drop the local trace from every live frame below the root.
+
+        Frames created before continue mode was entered still carry our
+        callback as their local trace function; clearing it means their
+        remaining lines execute at full speed.
+        """
+
+        if TRACE_EXT_AVAILABLE:
+            callback = _trace_ext.trace_callback
+        else:
+            callback = self._trace
+        frame: Optional[FrameType] = sys._getframe()
+        while frame is not None:
+            # Bound methods are recreated per access, so compare by ==.
+            if frame is not self._root_frame and frame.f_trace == callback:
+                frame.f_trace = None
+            frame = frame.f_back
+
     def _prompt(self) -> None:
+        if self._use_rich and self._live is not None:
+            # Make sure the state for the current event is on screen before
+            # blocking on input.
+            self._live.refresh()
         prompt_text = "step [Enter] | continue [c] | quit [q]: "
         while True:
             if self._use_rich and self._live is not None:
@@ -390,10 +786,10 @@ class Visualizer:
             else:
                 user_input = input(prompt_text).strip().lower()
             if user_input in {"", "s", "n"}:
-                self._continue_until_return = False
+                self._set_continue(False)
                 return
             if user_input == "c":
-                self._continue_until_return = True
+                self._set_continue(True)
                 return
             if user_input == "q":
                 raise KeyboardInterrupt("Visualization aborted by user")